@@ -9,6 +9,9 @@ import statsmodels.api as _sm
 ## https://github.com/statsmodels/statsmodels/issues/4772 ##
 import types as _types
 import pickle as _pickle
+import hashlib as _hashlib
+import copy as _copy
+import threading as _threading
 if _types.MethodType in _pickle.dispatch_table.keys():
     del _pickle.dispatch_table[_types.MethodType]
 
@@ -24,32 +27,82 @@ def _series2np(x):
         return x.values
     else:
         return x
+
+
+def _as_dtype(x, dtype):
+    """
+    Returns x as an array, cast to dtype when one is given.
+    Object arrays fall back to float64.
+    """
+    x = _np.asarray(x)
+    if dtype is None:
+        if not x.dtype.hasobject:
+            return x
+        dtype = _np.float64
+    return x.astype(dtype, copy=False)
+
+
+def _power(x, exponent, out=None):
+    """
+    Returns x**exponent. The half integer exponents of the default
+    tweedie power (1.5, -.5, .5) go through sqrt, which is cheaper than
+    the generic pow. out must not be x.
+    """
+    if exponent in (.5, -.5, 1.5):
+        out = _np.sqrt(x, out=out)
+        if exponent == -.5:
+            _np.divide(1., out, out=out)
+        elif exponent == 1.5:
+            out *= x
+        return out
+    return _np.power(x, exponent, out=out)
     
 ### Model Statistics
 
-def weighted_gini(weight, actual, predicted):
-    weight = _series2np(weight)
-    actual = _series2np(actual)
-    predicted = _series2np(predicted)
+def weighted_gini(weight, actual, predicted, dtype=None):
+    """
+    Weighted gini index.
+
+    dtype: (None)
+        numpy.dtype: compute in this dtype, e.g. numpy.float32 trades
+        precision for memory bandwidth on large inputs. Default float64.
+    """
+    weight = _as_dtype(weight, dtype)
+    actual = _as_dtype(actual, dtype)
+    predicted = _as_dtype(predicted, dtype)
     
+    # weight and weight * actual share one buffer so the sort is a single gather
+    buffer = _np.empty((2, len(weight)), dtype=dtype)
+    buffer[0] = weight
+    _np.multiply(weight, actual, out=buffer[1])
     # Sort by predicted in descending order
-    sort_index = _np.argsort(predicted)[::-1]
-    weight = weight[sort_index]
-    actual = actual[sort_index]
-    # Cumulative sums
-    cumulative_weight = _np.cumsum(weight)
-    cumulative_actual = _np.cumsum(weight * actual)
-    # Calculate products
-    sum_a = sum(cumulative_weight[1:] * cumulative_actual[:-1])
-    sum_b = sum(cumulative_weight[:-1] * cumulative_actual[1:])
+    weight, weighted_actual = buffer[:, _np.argsort(predicted)[::-1]]
+    # Mid-point of each observation's cumulative weight rank, the running
+    # sum always accumulates in float64
+    rank = _np.cumsum(weight, dtype=_np.float64)
+    total_weight = rank[-1]
+    rank -= weight / 2
     # Rescale
-    gini = (sum_b - sum_a) / (cumulative_weight[-1] * cumulative_actual[-1])
+    gini = 2 * _np.dot(weighted_actual, rank) / (
+        total_weight * _np.sum(weighted_actual)) - 1
     return abs(gini)
 
 
-def weighted_rmse(weight, actual, predicted):
-    return _np.sqrt(
-        _np.sum(weight * _np.power(actual - predicted, 2)) / _np.sum(weight))
+def weighted_rmse(weight, actual, predicted, dtype=None):
+    """
+    Weighted root mean squared error.
+
+    dtype: (None)
+        numpy.dtype: compute in this dtype, e.g. numpy.float32 trades
+        precision for memory bandwidth on large inputs. Default float64.
+    """
+    dtype = _np.float64 if dtype is None else dtype
+    weight = _np.asarray(weight, dtype=dtype)
+    # squared error is built in place and reduced with a dot product
+    se = _np.subtract(_np.asarray(actual, dtype=dtype),
+                      _np.asarray(predicted, dtype=dtype))
+    se *= se
+    return _np.sqrt(_np.dot(weight, se) / _np.sum(weight))
 
 
 def pearson_chi_sq_scale_estimate(actual,
@@ -57,13 +110,16 @@ def pearson_chi_sq_scale_estimate(actual,
                                   predicted,
                                   p=100,
                                   tweedie_power=1.5):
-    predicted_temp = predicted.copy()
-    predicted_temp[predicted_temp <= 0] = .0000001
+    predicted_temp = _np.maximum(_np.asarray(predicted, dtype=_np.float64),
+                                 .0000001)
 
     n = len(actual)
-    se = _np.power(actual - predicted_temp, 2)  # square error
-    v = _np.power(predicted_temp, tweedie_power)  # variance function
-    return 1 / (n - p) * _np.sum(weight * se / v)
+    se = _np.subtract(_np.asarray(actual, dtype=_np.float64),
+                      predicted_temp)  # square error
+    se *= se
+    v = _power(predicted_temp, tweedie_power)  # variance function
+    se /= v
+    return 1 / (n - p) * _np.dot(_np.asarray(weight, dtype=_np.float64), se)
 
 
 def weighted_average(x, w):
@@ -74,27 +130,106 @@ def weighted_average(x, w):
 def chi_sq_tweedie(phi, p):
     "Standardizes groups of observations coming from tweedie distribution"
 
-    def weighted_average(x, w):
-        "Returns the weighted average"
-        return _np.sum(x * w) / _np.sum(w)
-
     def inner(grp):
-        wavg_actual = weighted_average(grp.actual, grp.weight)
-        wavg_predicted = weighted_average(grp.predicted, grp.weight)
-        return _np.power(wavg_actual - wavg_predicted, 2) / (
-            (phi * _np.power(wavg_predicted, p)) / _np.sum(grp.weight))
+        weight = grp['weight'].values
+        sum_w = _np.sum(weight)
+        wavg_actual = _np.dot(grp['actual'].values, weight) / sum_w
+        wavg_predicted = _np.dot(grp['predicted'].values, weight) / sum_w
+        return (wavg_actual - wavg_predicted)**2 / (
+            (phi * _np.power(wavg_predicted, p)) / sum_w)
 
     return inner
 
 
+def _array_hash(x):
+    "Returns a content hash of an array like"
+    x = _np.ascontiguousarray(_series2np(x))
+    if x.dtype.hasobject:
+        # object arrays hold pointers, hash the values instead
+        x = _np.ascontiguousarray(x, dtype=_np.float64)
+    digest = _hashlib.sha1(x)
+    digest.update('{0}{1}'.format(x.dtype.str, x.shape).encode())
+    return digest.hexdigest()
+
+
+# the metric caches are shared between threads evaluating models
+_CACHE_LOCK = _threading.Lock()
+
+
+def _cache_get(cache, key):
+    "Returns the cached value for key or None"
+    with _CACHE_LOCK:
+        return cache.get(key)
+
+
+def _cache_put(cache, size, key, value):
+    "Stores value under key, dropping the oldest entry when full"
+    with _CACHE_LOCK:
+        if key not in cache and len(cache) >= size:
+            del cache[next(iter(cache))]
+        cache[key] = value
+
+
+_QUANTILE_CACHE = {}
+_QUANTILE_CACHE_SIZE = 8
+
+
+def _compute_quantile_assignment(weight, predicted, bins):
+    """
+    Returns the weighted quantile each prediction falls in.
+    Results are cached by content so hl_tweedie and plot_hl
+    can share the weighted quantile sort.
+    """
+    key = (_array_hash(weight), _array_hash(predicted), bins)
+    quantile = _cache_get(_QUANTILE_CACHE, key)
+    if quantile is None:
+        predicted = _np.asarray(predicted)
+        order = _np.argsort(predicted, kind='mergesort')
+        predicted_sorted = predicted[order]
+        cumulative_weight = _np.cumsum(_np.asarray(weight)[order])
+
+        # weighted quantiles, same definition as statsmodels DescrStatsW
+        targets = cumulative_weight[-1] * _np.arange(1, bins) / bins
+        idx = _np.searchsorted(cumulative_weight, targets)
+        qs = predicted_sorted[idx]
+        exact = ((_np.abs(targets - cumulative_weight[idx]) < 1e-10)
+                 & (idx < len(cumulative_weight) - 1))
+        qs[exact] = (predicted_sorted[idx[exact]] +
+                     predicted_sorted[idx[exact] + 1]) / 2
+
+        quantile = _np.searchsorted(qs, predicted)
+        quantile.flags.writeable = False
+        _cache_put(_QUANTILE_CACHE, _QUANTILE_CACHE_SIZE, key, quantile)
+    return quantile
+
+
+def _hl_tweedie_arrays(weight, actual, predicted, bins):
+    "Returns the quantile, weight, actual and floored predicted arrays"
+    weight = _np.asarray(weight, dtype=_np.float64)
+    predicted = _np.asarray(predicted, dtype=_np.float64)
+    quantile = _compute_quantile_assignment(weight, predicted, bins)
+
+    predicted_temp = _np.maximum(predicted, .0000001)
+    return (quantile, weight, _np.asarray(actual, dtype=_np.float64),
+            predicted_temp)
+
+
+def _quantile_weighted_averages(quantile, weight, actual, predicted):
+    """
+    Returns the quantiles holding observations with their
+    weight sums and weighted averages of actual and predicted.
+    """
+    has_obs = _np.bincount(quantile) > 0
+    sum_w = _np.bincount(quantile, weights=weight)[has_obs]
+    sum_wa = _np.bincount(quantile, weights=weight * actual)[has_obs]
+    sum_wp = _np.bincount(quantile, weights=weight * predicted)[has_obs]
+    return _np.flatnonzero(has_obs), sum_w, sum_wa / sum_w, sum_wp / sum_w
+
+
 def hl_tweedie_df(weight, actual, predicted, bins=10, phi=1.0, p=1.5):
     "Calculates Hosmer-Lemeshow statistic for observations coming from tweedie distribution"
-    predicted_temp = predicted.copy()
-    predicted_temp[predicted_temp <= 0] = .0000001
-
-    qs = _sm.stats.DescrStatsW(
-        predicted, weights=weight).quantile(_np.arange(1, bins) * 1 / bins)
-    quantile = _np.searchsorted(qs, predicted)
+    quantile, weight, actual, predicted_temp = _hl_tweedie_arrays(
+        weight, actual, predicted, bins)
     df = _pd.DataFrame({
         'weight': _np.array(weight),
         'actual': _np.array(actual),
@@ -105,39 +240,117 @@ def hl_tweedie_df(weight, actual, predicted, bins=10, phi=1.0, p=1.5):
 
 
 def hl_tweedie(weight, actual, predicted, bins=10, phi=1.0, p=1.5):
-    df = hl_tweedie_df(weight, actual, predicted, bins, phi, p)
-    return df.groupby('quantile').apply(chi_sq_tweedie(phi, p)).sum()
+    _, sum_w, wavg_actual, wavg_predicted = _quantile_weighted_averages(
+        *_hl_tweedie_arrays(weight, actual, predicted, bins))
+    diff = wavg_actual - wavg_predicted
+    # quantiles holding only zero weight rows are NaN, skip them like
+    # the groupby sum did
+    return _np.nansum(diff * diff / (
+        (phi * _np.power(wavg_predicted, p)) / sum_w))
 
 
-def deviance_tweedie(actual, predicted, weight, p=1.5):
-    predicted_temp = predicted.copy()
-    predicted_temp[predicted_temp <= 0] = .0000001
-    tweedie = _sm.families.Tweedie(var_power=p)
-    return tweedie.deviance(actual, predicted_temp, freq_weights=weight)
+def _tweedie_deviance(actual, predicted, weight, p):
+    """
+    Weighted tweedie deviance for p not in (1, 2), same as statsmodels
+    Tweedie.deviance. The unit deviances are built in one buffer and
+    reduced with a dot product, mu**(2-p) reuses mu**(1-p).
+    """
+    mu_pow = _power(predicted, 1 - p)
+    dev = predicted / (2 - p)
+    dev -= actual / (1 - p)
+    dev *= mu_pow
+    y_pow = _power(actual, 2 - p, out=mu_pow)
+    y_pow /= (1 - p) * (2 - p)
+    dev += y_pow
+    return 2 * _np.dot(weight, dev)
 
 
-def model_stats_reg(
-        train_set,
-        valid_set
-    ):
+def deviance_tweedie(actual, predicted, weight, p=1.5, dtype=None):
     """
-    Returns common metrics for a regression model.
-    
-    Arrgs:
-    
-    train_set:
-        dict: {'y' : list, 'pred' : list, 'w' : list}
-    valid_set:
-        dict: {'y' : list, 'pred' : list, 'w' : list}
+    Weighted tweedie deviance.
+
+    dtype: (None)
+        numpy.dtype: compute in this dtype, e.g. numpy.float32 trades
+        precision for memory bandwidth on large inputs. Default float64.
+        For p of 1 or 2 the inputs are cast but statsmodels computes the
+        deviance, and may upcast (p = 2 returns float64).
     """
-    out_dict = {'train': {}, 'valid': {}}
-    has_weight = False
-    if 'w' not in train_set:
-        has_weight = True
-        train_set['w'] = _np.ones(len(train_set['y']))
-        if valid_set is not None:
-            train_set['w'] = _np.ones(len(valid_set['y']))
+    dtype = _np.float64 if dtype is None else dtype
+    predicted_temp = _np.maximum(_np.asarray(predicted, dtype=dtype),
+                                 .0000001)
+    actual = _as_dtype(actual, dtype)
+    weight = _as_dtype(weight, dtype)
+    if p in (1, 2):
+        tweedie = _sm.families.Tweedie(var_power=p)
+        return tweedie.deviance(actual, predicted_temp, freq_weights=weight)
+    return _tweedie_deviance(actual, predicted_temp, weight, p)
+
 
+_STATS_CACHE = {}
+_STATS_CACHE_SIZE = 32
+
+
+def _stats_cache_key(kind, train_set, valid_set, *args):
+    """
+    Returns a cache key from the contents of the train and valid sets,
+    or None when they can not be hashed (those results are not cached).
+    """
+    key = [kind] + list(args)
+    try:
+        for data_set in [train_set, valid_set]:
+            if data_set is None:
+                key.append(None)
+            else:
+                key.append(tuple(
+                    _array_hash(data_set[k]) if k in data_set else None
+                    for k in ['y', 'pred', 'w']))
+    except (TypeError, ValueError):
+        return None
+    return tuple(key)
+
+
+def _cache_stats(key, out_dict):
+    "Stores a copy of out_dict"
+    if key is not None:
+        _cache_put(_STATS_CACHE, _STATS_CACHE_SIZE, key,
+                   _copy.deepcopy(out_dict))
+
+
+def _cached_stats(key):
+    "Returns a copy of the cached out_dict for key or None"
+    if key is None:
+        return None
+    out_dict = _cache_get(_STATS_CACHE, key)
+    return None if out_dict is None else _copy.deepcopy(out_dict)
+
+
+def _prep_stats_sets(train_set, valid_set):
+    """
+    Fills in default weights and converts y, pred and w to arrays.
+    Returns whether train_set came with weights.
+    """
+    has_weight = 'w' in train_set
+    for data_set in [train_set, valid_set]:
+        if data_set is None:
+            continue
+        if 'w' not in data_set:
+            data_set['w'] = _np.ones(len(data_set['y']))
+        # convert once, np.asarray does not copy existing arrays
+        for col in ['y', 'pred', 'w']:
+            data_set[col] = _np.asarray(data_set[col])
+    return has_weight
+
+
+def _model_stats_reg(train_set, valid_set, dtype, key, has_weight):
+    """
+    Returns model_stats_reg's out_dict for sets already passed through
+    _prep_stats_sets and whether every metric ran.
+    """
+    out_dict = _cached_stats(key)
+    if out_dict is not None:
+        return out_dict, True
+
+    out_dict = {'train': {}, 'valid': {}}
     try:
         # The mean squared error
         out_dict['train']['rmse'] = [
@@ -154,14 +367,14 @@ def model_stats_reg(
 
         # Gini
         out_dict['train']['gini'] = [
-            weighted_gini(_np.array(train_set['w']), _np.array(train_set['y']), train_set['pred'])
+            weighted_gini(train_set['w'], train_set['y'], train_set['pred'], dtype=dtype)
         ]
         
 
         # weighted_rmse
         if has_weight:
             out_dict['train']['weighted_rmse'] = [
-                weighted_rmse(_np.array(train_set['w']), _np.array(train_set['y']), train_set['pred'])
+                weighted_rmse(train_set['w'], train_set['y'], train_set['pred'], dtype=dtype)
             ]
         
 
@@ -171,26 +384,58 @@ def model_stats_reg(
             ]
             out_dict['valid']['mae'] = [_metrics.mean_absolute_error(valid_set['y'], valid_set['pred'])]
             out_dict['valid']['gini'] = [
-                weighted_gini(_np.array(valid_set['w']), _np.array(valid_set['y']), valid_set['pred'])
+                weighted_gini(valid_set['w'], valid_set['y'], valid_set['pred'], dtype=dtype)
             ]
             out_dict['valid']['weighted_rmse'] = [
-                weighted_rmse(_np.array(valid_set['w']), _np.array(valid_set['y']), valid_set['pred'])
+                weighted_rmse(valid_set['w'], valid_set['y'], valid_set['pred'], dtype=dtype)
             ]
             #     out_dict['valid']['r2'] = [_metrics.r2_score(valid_y, valid_pred)]
 
     except Exception as e:
         print('Stats Failed to run')
         print(e)
+        return out_dict, False
 
-    return out_dict
+    _cache_stats(key, out_dict)
+    return out_dict, True
+
+
+def model_stats_reg(
+        train_set,
+        valid_set,
+        dtype=None
+    ):
+    """
+    Returns common metrics for a regression model.
+    Results are cached by the contents of y, pred and w.
+    Safe to call from several threads with separate set dicts, e.g. to
+    evaluate candidate models with a ThreadPoolExecutor; the NumPy
+    kernels release the GIL.
+    
+    Arrgs:
+    
+    train_set:
+        dict: {'y' : list, 'pred' : list, 'w' : list}
+    valid_set:
+        dict: {'y' : list, 'pred' : list, 'w' : list}
+    dtype: (None)
+        numpy.dtype: dtype for the gini and weighted_rmse kernels,
+        e.g. numpy.float32. Default float64.
+    """
+    key = _stats_cache_key('reg', train_set, valid_set, dtype)
+    has_weight = _prep_stats_sets(train_set, valid_set)
+    return _model_stats_reg(train_set, valid_set, dtype, key, has_weight)[0]
 
 
 def model_stats_tweedie(train_set,
                         valid_set=None,
-                        p=1.5):
+                        p=1.5,
+                        dtype=None):
     """
     Returns common metrics for a regression model 
     with a tweedie distribution assumptions.
+    Results are cached by the contents of y, pred, w and p.
+    Safe to call from several threads, see model_stats_reg.
     
     Arrgs:
     
@@ -200,20 +445,32 @@ def model_stats_tweedie(train_set,
         dict: {'y' : list, 'pred' : list, 'w' : list}
     p: (1.5)
         float: tweedie power. 
+    dtype: (None)
+        numpy.dtype: dtype for the gini, weighted_rmse and deviance
+        kernels, e.g. numpy.float32. Default float64.
     """
 
-    out_dict = model_stats_reg(
+    # keys are taken before the sets get their default weights
+    reg_key = _stats_cache_key('reg', train_set, valid_set, dtype)
+    key = None if reg_key is None else ('tweedie', p, reg_key)
+    has_weight = _prep_stats_sets(train_set, valid_set)
+
+    out_dict = _cached_stats(key)
+    if out_dict is not None:
+        return out_dict
+
+    # partial results from failed regression metrics are not cached
+    out_dict, complete = _model_stats_reg(
         train_set,
-        valid_set
+        valid_set,
+        dtype,
+        reg_key,
+        has_weight
         )
-    if 'w' not in train_set:
-        train_set['w'] = _np.ones(len(train_set['y']))
-        if valid_set is not None:
-            train_set['w'] = _np.ones(len(valid_set['y']))
 
     # Tweedie Deviance
     out_dict['train']['tweedie_deviance'] = [
-        deviance_tweedie(train_set['y'], train_set['pred'], train_set['w'], p=p)
+        deviance_tweedie(train_set['y'], train_set['pred'], train_set['w'], p=p, dtype=dtype)
     ]
     
 
@@ -227,13 +484,15 @@ def model_stats_tweedie(train_set,
 
     if valid_set is not None:
         out_dict['valid']['tweedie_deviance'] = [
-            deviance_tweedie(valid_set['y'], valid_set['pred'], valid_set['w'], p=p)
+            deviance_tweedie(valid_set['y'], valid_set['pred'], valid_set['w'], p=p, dtype=dtype)
         ]
         out_dict['valid']['hl_tweedie'] = [
             hl_tweedie(
             valid_set['w'], valid_set['y'], valid_set['pred'], phi=valid_phi, p=p)
         ]
 
+    if complete:
+        _cache_stats(key, out_dict)
     return out_dict
 
 def model_stats_bool(
@@ -251,12 +510,10 @@ def model_stats_bool(
         dict: {'y' : list, 'pred' : list, 'w' : list}
     """
     out_dict = {'train': {}, 'valid': {}}
-    has_weight = False
     if 'w' not in train_set:
-        has_weight = True
         train_set['w'] = _np.ones(len(train_set['y']))
-        if valid_set is not None:
-            train_set['w'] = _np.ones(len(valid_set['y']))
+    if valid_set is not None and 'w' not in valid_set:
+        valid_set['w'] = _np.ones(len(valid_set['y']))
 
     try:
         pred_class = _np.where(train_set['pred']>.5, 1, 0)
@@ -391,18 +648,14 @@ def plot_hl(weight,
 
     _plt.rcParams['figure.figsize'] = plt_size
 
-    hl_df = hl_tweedie_df(weight, actual, predicted, bins, phi, p)
-    hl_df = hl_df.apply(_pd.to_numeric)
-    hl_df_qrt_actual = hl_df.groupby('quantile').apply(
-        lambda x: weighted_average(x['actual'], x['weight'])).reset_index()
-    hl_df_qrt_actual.columns = ['quantile', 'actual']
-    hl_df_qrt_predicted = hl_df.groupby('quantile').apply(
-        lambda x: weighted_average(x['predicted'], x['weight'])).reset_index()
-    hl_df_qrt_predicted.columns = ['quantile', 'predicted']
-    hl_df_qrt = _pd.merge(hl_df_qrt_actual, hl_df_qrt_predicted, on='quantile')
-    
-    
-    
+    quantiles, _, wavg_actual, wavg_predicted = _quantile_weighted_averages(
+        *_hl_tweedie_arrays(weight, actual, predicted, bins))
+    hl_df_qrt = _pd.DataFrame({
+        'quantile': quantiles,
+        'actual': wavg_actual,
+        'predicted': wavg_predicted
+    }, columns=['quantile', 'actual', 'predicted'])
+
     if return_fig:
         return hl_df_qrt.plot(x='quantile').get_figure()
     else:
@@ -524,7 +777,10 @@ def plot_pareto(y,
     if not numeric:
         temp_df['label'] = temp_df['label'].astype('str')
 
-    max_per = temp_df['per_ttl'][temp_df['per_ttl'] < cutoff].max()
+    # per_ttl is non decreasing, take the first point of the last step under cutoff
+    per_ttl = temp_df['per_ttl'].values
+    max_per = per_ttl[max(_np.searchsorted(per_ttl, cutoff) - 1, 0)]
+    cutoff_label = temp_df['label'].iat[_np.searchsorted(per_ttl, max_per)]
 
     fig, ax = _plt.subplots()
     ax2 = ax.twinx()
@@ -533,7 +789,7 @@ def plot_pareto(y,
     ax2.plot(list(temp_df['label']), temp_df['per_ttl'], ls='--', c='red')
     #     ax2.axhline(.95, ls='--', c='red')
     _plt.axvline(
-        temp_df['label'][temp_df['per_ttl'] == max_per].values[0],
+        cutoff_label,
         ls='--',
         c='red')
     _plt.setp(ax.xaxis.get_majorticklabels(), rotation=90)
@@ -595,10 +851,9 @@ def get_glm_label_and_count_table(label_dicts, data):
             })
         ])
 
-        bins_df.index = bins_df.apply(lambda x: _v_utils.label_dict_formater(
-                                                 x['sep'], 
-                                                 feature_name, 
-                                                 str(x['bin'])), axis=1)
+        bins_df.index = [_v_utils.label_dict_formater(sep, feature_name, str(bin_))
+                         for sep, bin_ in zip(bins_df['sep'].values,
+                                              bins_df['bin'].values)]
         bins_df.index = _np.where(bins_df['hold'] == 1, feature_name + '___const', bins_df.index)
 
         bins_df = _pd.concat(
@@ -626,15 +881,6 @@ def get_glm_error(mdl_stats, label_dicts):
     base_std = mdl_stats['Std.Err.'][mdl_stats.index == 'const'].values[0]
     base_cov = mdl_stats['cov'][mdl_stats.index == 'const'].values[0]
 
-    def calc_err(row, err_type):
-        coefs = base_coef + row['Coef.']
-        err_term = 2 * _np.sqrt(base_std**2 + row['Std.Err.']**2 +
-                               2 * row['cov'])
-        if err_type == 'pos':
-            return _np.exp(coefs + err_term)
-        elif err_type == 'neg':
-            return _np.exp(coefs - err_term)
-
     for feature_set in label_dicts.items():
         feature_name = feature_set[0]
         feature_dict = feature_set[1]
@@ -661,10 +907,12 @@ def get_glm_error(mdl_stats, label_dicts):
             mdl_stats_fltrd['cov'])
 
         # calc error
-        mdl_stats_fltrd['error+'] = mdl_stats_fltrd.apply(
-            lambda x: calc_err(x, 'pos'), axis=1)
-        mdl_stats_fltrd['error-'] = mdl_stats_fltrd.apply(
-            lambda x: calc_err(x, 'neg'), axis=1)
+        coefs = base_coef + mdl_stats_fltrd['Coef.'].values
+        err_term = 2 * _np.sqrt(base_std**2 +
+                                mdl_stats_fltrd['Std.Err.'].values**2 +
+                                2 * mdl_stats_fltrd['cov'].values)
+        mdl_stats_fltrd['error+'] = _np.exp(coefs + err_term)
+        mdl_stats_fltrd['error-'] = _np.exp(coefs - err_term)
 
         #set error for base level
         mdl_stats_fltrd['error+'] = _np.where(
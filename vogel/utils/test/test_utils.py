@@ -1,6 +1,8 @@
 import numpy as _np
 import pandas as _pd
 
+import statsmodels.api as _sm
+
 import matplotlib.pyplot as _plt
 _plt.switch_backend('agg')
 
@@ -27,6 +29,11 @@ data_dict = {
   , 'grp_other': ['a', 'c']
 }
 
+# Metric Test Data
+stats_w = _np.array([1., 2., 1., 3., 1.])
+stats_y = _np.array([0., 3., 1., 0., 5.])
+stats_pred = _np.array([.1, .9, .4, .2, .7])
+
 #TODO work out issues with this
 class TestFindLabelDicts(object):
     def test_ld(self):
@@ -49,3 +56,140 @@ class TestPlots(object):
     
     def test_one_way_plot(self):
         _v_stats.plot_one_way_fit(df['a'], df['e'])
+
+    def test_hl_plot(self):
+        fig = _v_stats.plot_hl(df['e'], df['a'], df['b'].fillna(0),
+                               bins=2, return_fig=True)
+        labels = [line.get_label() for line in fig.axes[0].get_lines()]
+        assert labels == ['actual', 'predicted']
+
+
+class TestStats(object):
+    def test_weighted_gini(self):
+        # reference: cumulative sums sorted by descending prediction
+        order = _np.argsort(stats_pred)[::-1]
+        cw = _np.cumsum(stats_w[order])
+        ca = _np.cumsum(stats_w[order] * stats_y[order])
+        expected = abs((_np.sum(cw[:-1] * ca[1:]) - _np.sum(cw[1:] * ca[:-1]))
+                       / (cw[-1] * ca[-1]))
+        assert _np.isclose(
+            _v_stats.weighted_gini(stats_w, stats_y, stats_pred), expected)
+
+    def test_object_dtype_rmse(self):
+        w = _np.array([1., 2., 1.])
+        y = _np.array([0., 3., 1.])
+        pred = _np.array([.5, 2., 2.])
+        assert _np.isclose(
+            _v_stats.weighted_rmse(_pd.Series(w, dtype=object),
+                                   _pd.Series(y, dtype=object),
+                                   _pd.Series(pred, dtype=object)),
+            _v_stats.weighted_rmse(w, y, pred))
+
+    def test_deviance_tweedie(self):
+        with _np.errstate(divide='ignore'):
+            for p in [0, 1.2, 1.5, 3]:
+                expected = _sm.families.Tweedie(var_power=p).deviance(
+                    stats_y, stats_pred, freq_weights=stats_w)
+                _np.testing.assert_allclose(
+                    _v_stats.deviance_tweedie(stats_y, stats_pred, stats_w,
+                                              p=p),
+                    expected)
+
+    def test_object_dtype_tweedie(self):
+        w = _np.array([1., 2., 1., 3., 1., 2.])
+        y = _np.array([0., 3., 1., 0., 5., 1.])
+        pred = _np.array([.1, .9, .4, -.2, .7, .3])
+        obj = [_pd.Series(x, dtype=object) for x in (w, y, pred)]
+        assert _np.isclose(_v_stats.hl_tweedie(*obj, bins=3),
+                           _v_stats.hl_tweedie(w, y, pred, bins=3))
+        assert _np.isclose(
+            _v_stats.deviance_tweedie(obj[1], obj[2], obj[0]),
+            _v_stats.deviance_tweedie(y, pred, w))
+        assert _np.isclose(
+            _v_stats.pearson_chi_sq_scale_estimate(obj[1], obj[0], obj[2],
+                                                   p=0),
+            _v_stats.pearson_chi_sq_scale_estimate(y, w, pred, p=0))
+
+    def test_float32_metrics(self):
+        for metric in [_v_stats.weighted_gini, _v_stats.weighted_rmse]:
+            assert _np.isclose(
+                metric(stats_w, stats_y, stats_pred, dtype=_np.float32),
+                metric(stats_w, stats_y, stats_pred), rtol=1e-5)
+        with _np.errstate(divide='ignore', invalid='ignore'):
+            for p in [1, 1.5, 2]:
+                assert _np.isclose(
+                    _v_stats.deviance_tweedie(stats_y, stats_pred, stats_w,
+                                              p=p, dtype=_np.float32),
+                    _v_stats.deviance_tweedie(stats_y, stats_pred, stats_w,
+                                              p=p),
+                    rtol=1e-5)
+
+    def test_hl_tweedie(self):
+        w = _np.array([1., 0., 2., 1., .5, 1., 2., 1.])
+        y = _np.array([0., 1., 3., 0., 2., 0., 4., 1.])
+        pred = _np.array([.3, .1, .3, .9, .5, -.2, .7, .5])
+        # the last case has a top quantile holding only a zero weight row
+        cases = [(w, y, pred, 2), (w, y, pred, 4),
+                 (_np.array([1., 1., 0., 1., 1.]),
+                  _np.array([1., 0., 2., 3., 1.]),
+                  _np.array([.1, .2, .9, .5, .4]), 5)]
+        for w, y, pred, bins in cases:
+            df_hl = _v_stats.hl_tweedie_df(w, y, pred, bins=bins)
+            expected = df_hl.groupby('quantile').apply(
+                _v_stats.chi_sq_tweedie(6000., 1.5)).sum()
+            assert _np.isfinite(expected)
+            assert _np.isclose(
+                _v_stats.hl_tweedie(w, y, pred, bins=bins, phi=6000.),
+                expected)
+
+    def test_object_dtype_gini(self):
+        assert _np.isclose(
+            _v_stats.weighted_gini(stats_w, _pd.Series(stats_y, dtype=object),
+                                   stats_pred),
+            _v_stats.weighted_gini(stats_w, stats_y, stats_pred))
+        out = _v_stats.model_stats_reg(
+            {'y': _np.array(stats_y, dtype=object), 'pred': stats_pred,
+             'w': stats_w}, None)
+        assert 'gini' in out['train'] and 'weighted_rmse' in out['train']
+
+    def test_quantile_assignment(self):
+        w = _np.array([1., 0., 2., 1., .5, 1., 2., 1.])
+        pred = _np.array([.3, .1, .3, .9, .5, .2, .7, .5])
+        qs = _sm.stats.DescrStatsW(pred, weights=w).quantile(
+            _np.arange(1, 4) / 4)
+        _np.testing.assert_array_equal(
+            _v_stats.stats._compute_quantile_assignment(w, pred, 4),
+            _np.searchsorted(qs, pred))
+
+    def test_quantile_cache_object_dtype(self):
+        w = _np.ones(6)
+        for pred in [[.1, .2, .3, .4, .5, .6], [.6, .5, .4, .3, .2, .1]]:
+            assignment = _v_stats.stats._compute_quantile_assignment(
+                w, _np.array(pred, dtype=object), 3)
+            _np.testing.assert_array_equal(
+                assignment,
+                _v_stats.stats._compute_quantile_assignment(
+                    w, _np.array(pred), 3))
+
+    def test_model_stats_cache(self):
+        train_set = {'y': _np.array([1., 0., 2., 3.]),
+                     'pred': _np.array([1., .5, 1.5, 2.])}
+        first = _v_stats.model_stats_tweedie(dict(train_set))
+        first['train']['rmse'] = None
+        second = _v_stats.model_stats_tweedie(dict(train_set))
+        assert second['train']['rmse'][0] > 0
+        assert 'weighted_rmse' not in second['train']
+
+        # inputs are normalized the same way on a cache hit
+        third = dict(train_set, y=list(train_set['y']))
+        _v_stats.model_stats_tweedie(third)
+        assert isinstance(third['y'], _np.ndarray)
+        assert (third['w'] == 1).all()
+
+    def test_model_stats_failure_not_cached(self):
+        train_set = {'y': _np.array([1., 0., 2., 3.]),
+                     'pred': _np.array(['a', 'b', 'c', 'd'], dtype=object)}
+        cached = len(_v_stats.stats._STATS_CACHE)
+        out = _v_stats.model_stats_reg(dict(train_set), None)
+        assert 'gini' not in out['train']
+        assert len(_v_stats.stats._STATS_CACHE) == cached